@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the Project Chimera CI enforcement scripts
+Keeps file discovery and the line-scanning engine in one place so a single
+process can run every check
+Part of Phase 0 quality gates
+"""
+
+import io
+import os
+import re
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Callable, Optional
+
+# Root every enforcer scans (scripts are run from the Unity project root)
+PROJECT_ROOT = "Assets/ProjectChimera"
+
+def walk_cs_paths(directory, exclude_name_parts=()):
+    """Yield .cs file paths (str) under directory in the same order Path.rglob would
+
+    Entries whose name contains any of exclude_name_parts are skipped; excluded
+    directories are never descended into.
+    """
+    subdirs = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if any(part in entry.name for part in exclude_name_parts):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.endswith(".cs"):
+                    yield entry.path
+    except OSError:
+        return
+
+    for subdir in subdirs:
+        yield from walk_cs_paths(subdir, exclude_name_parts)
+
+@lru_cache(maxsize=1)
+def all_cs_files():
+    """Return every C# file under Assets/ProjectChimera, walked once per process"""
+    return tuple(Path(path) for path in walk_cs_paths(PROJECT_ROOT))
+
+def staged_cs_files():
+    """Return C# files under Assets/ProjectChimera that are staged for commit"""
+    output = subprocess.check_output(
+        ["git", "diff", "--name-only", "--cached", "--diff-filter=ACM", "-z"],
+        text=True
+    )
+    return tuple(
+        Path(path) for path in output.split("\0")
+        if path.endswith(".cs") and path.startswith(PROJECT_ROOT + "/")
+    )
+
+def target_cs_files():
+    """Return the files to scan - only staged files with --staged (pre-commit), else the whole tree (CI)"""
+    if "--staged" in sys.argv:
+        return staged_cs_files()
+    return all_cs_files()
+
+# Below this many files (e.g. a --staged pre-commit run) scanning them directly
+# is cheaper than ripgrep walking the whole tree
+RIPGREP_MIN_FILES = 200
+
+def ripgrep_filter(pattern, files):
+    """Narrow files to those ripgrep finds pattern in
+
+    ripgrep walks and matches the tree on all cores far faster than Python can,
+    so only files with a candidate hit reach the per-line Python checks. Returns
+    files unchanged when there are too few to be worth a tree walk, or when rg
+    is not installed or fails.
+    """
+    files = tuple(files)
+    if len(files) < RIPGREP_MIN_FILES:
+        return files
+
+    rg = shutil.which("rg")
+    if rg is None:
+        return files
+
+    try:
+        result = subprocess.run(
+            [rg, "--files-with-matches", "--no-ignore", "--hidden", "--no-messages",
+             "--path-separator", "/", "-g", "*.cs", "-e", pattern, PROJECT_ROOT],
+            capture_output=True, text=True
+        )
+    except OSError:
+        return files
+
+    # Exit code 1 means no matches; anything else is an error
+    if result.returncode not in (0, 1):
+        return files
+
+    # rg prints '/'-separated paths (forced above, so Windows matches too)
+    matched = set(result.stdout.splitlines())
+    return tuple(file_path for file_path in files if Path(file_path).as_posix() in matched)
+
+# Each file is visited once with every rule applied during that visit, so only
+# the file currently being scanned needs to stay cached
+
+@lru_cache(maxsize=1)
+def file_text(path):
+    """Return the contents of a C# file, read once and shared by every rule scanning it
+
+    Undecodable bytes are replaced rather than aborting the file, so non-UTF-8
+    sources are still checked.
+    """
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+@lru_cache(maxsize=1)
+def file_lines(path):
+    """Return the lines of a C# file, split from the shared cached text"""
+    return tuple(io.StringIO(file_text(path)))
+
+def _hit_lines(content, find):
+    """Yield (line_num, line) for each line of content (str or bytes) holding a hit
+
+    find(start) returns the offset of the next hit at or after start, or -1.
+    Line numbers come from a C-level count of newlines, so lines without a hit
+    never reach a Python-level loop; each line is yielded at most once.
+    """
+    newline = '\n' if isinstance(content, str) else b'\n'
+    line_num = 1
+    line_start = 0
+    pos = find(0)
+
+    while pos != -1:
+        start = content.rfind(newline, 0, pos) + 1
+        line_num += content.count(newline, line_start, start)
+        line_start = start
+
+        end = content.find(newline, pos)
+        end = len(content) if end == -1 else end + 1
+        yield line_num, content[start:end]
+
+        # Resume on the next line
+        pos = find(end)
+
+def marker_lines(path, marker):
+    """Yield (line_num, line) for each line of a C# file that contains marker (located with str.find)"""
+    content = file_text(path)
+    return _hit_lines(content, lambda start: content.find(marker, start))
+
+def pattern_lines(content, pattern):
+    """Yield (line_num, line) for each line of content (str or bytes) where compiled pattern matches"""
+    def find(start):
+        match = pattern.search(content, start)
+        return match.start() if match else -1
+    return _hit_lines(content, find)
+
+def write_report(lines):
+    """Emit a finished report with one write instead of a print per line"""
+    sys.stdout.write("".join(line + "\n" for line in lines))
+
+# Larger .cs files are generated code (protobufs, asset caches), not hand-written source
+MAX_SCAN_BYTES = 2_000_000
+
+# Below this many files the process pool start-up costs more than it saves
+PARALLEL_THRESHOLD = 200
+
+def map_files(func, files):
+    """Return [func(file) for file in files], computed across CPU cores, in input order
+
+    func must be a module-level function so worker processes can import it.
+    """
+    files = list(files)
+    workers = os.cpu_count() or 1
+
+    if workers == 1 or len(files) < PARALLEL_THRESHOLD:
+        return [func(file_path) for file_path in files]
+
+    # Large chunks amortize the pickling round-trip per file
+    chunksize = max(1, len(files) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, files, chunksize=chunksize))
+
+def scan_files(scan_file, files):
+    """Run scan_file over every file across CPU cores and flatten the results"""
+    violations = []
+    for result in map_files(scan_file, files):
+        violations.extend(result)
+    return violations
+
+@dataclass(frozen=True)
+class Rule:
+    """A line-based ban enforced over every C# file"""
+    name: str
+    violation_re: re.Pattern
+    fast_marker: str                            # Literal every violation contains
+    exempt_files: frozenset = frozenset()       # Basenames allowed to use the API
+    exempt_dirs: frozenset = frozenset()        # Directory names allowed to use the API
+    skip_path_markers: tuple = ('.backup',)     # Path substrings that skip the file
+    skip_prefixes: tuple = ('//', '*')          # Comment/attribute line prefixes
+    skip_line_re: Optional[re.Pattern] = None   # String literals and other false positives
+    is_legitimate: Optional[Callable] = None    # (path_str, line_num) -> bool
+    severity: Optional[Callable] = None         # (line_content, path_str) -> severity label
+
+    def applies_to(self, file_path, path_str):
+        """Return False when the file is exempt from this rule"""
+        return not (file_path.name in self.exempt_files or
+                    not self.exempt_dirs.isdisjoint(file_path.parts) or
+                    any(marker in path_str for marker in self.skip_path_markers))
+
+def _scan_file_rules(rules, file_path):
+    """Apply every rule to a single C# file and return (rule name, violation) pairs"""
+    hits = []
+    path_str = file_path.as_posix()
+
+    # One stat avoids reading empty files and multi-megabyte generated code
+    try:
+        size = os.stat(path_str).st_size
+    except OSError:
+        return hits
+    if size == 0 or size > MAX_SCAN_BYTES:
+        return hits
+
+    # A failing rule is reported without dropping the remaining rules for this file
+    for rule in rules:
+        try:
+            if not rule.applies_to(file_path, path_str):
+                continue
+
+            # Jump straight to lines containing the rule's marker
+            for line_num, line in marker_lines(path_str, rule.fast_marker):
+                line_content = line.strip()
+
+                # Skip comments, attributes and string literals
+                if (line_content.startswith(rule.skip_prefixes) or
+                    (rule.skip_line_re and rule.skip_line_re.search(line_content))):
+                    continue
+
+                # Skip usage the rule considers legitimate in context
+                if rule.is_legitimate and rule.is_legitimate(path_str, line_num):
+                    continue
+
+                if rule.violation_re.search(line):
+                    violation = {
+                        'file': path_str,
+                        'line': line_num,
+                        'content': line_content,
+                        'pattern': rule.violation_re.pattern
+                    }
+                    if rule.severity:
+                        violation['severity'] = rule.severity(line_content, path_str)
+                    hits.append((rule.name, violation))
+        except Exception as e:
+            print(f"Error processing {file_path}: {e}")
+
+    return hits
+
+def run_rules(rules):
+    """Scan the target C# files once for all rules and return violations by rule name"""
+    rules = tuple(rules)
+    pattern = "|".join(f"(?:{rule.violation_re.pattern})" for rule in rules)
+    cs_files = ripgrep_filter(pattern, target_cs_files())
+
+    violations = {rule.name: [] for rule in rules}
+    for name, violation in scan_files(partial(_scan_file_rules, rules), cs_files):
+        violations[name].append(violation)
+    return violations
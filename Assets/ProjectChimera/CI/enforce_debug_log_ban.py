@@ -5,116 +5,95 @@ Enforces zero-tolerance for Debug.Log violations after migration
 Part of Project Chimera Phase 0 quality gates
 """
 
-import os
 import sys
 import re
-from pathlib import Path
+
+# Don't write __pycache__ into the Unity Assets folder (Unity would generate .meta files for it)
+sys.dont_write_bytecode = True
+
+from ci_common import Rule, run_rules, write_report
+
+# Single alternation covering Debug.Log, Debug.LogWarning, Debug.LogError and
+# the fully-qualified UnityEngine.Debug.Log forms
+VIOLATION_RE = re.compile(r'(?:UnityEngine\.)?Debug\.Log(?:Warning|Error)?\s*\(')
+
+# Literal substring every violation contains; lines without it are never visited
+_FAST_MARKER = "Debug.Log"
+
+# Comment prefixes - str.startswith checks the whole tuple in one C call
+_SKIP_PREFIXES = ('//', '*')
+
+# Debug.Log quoted inside a string literal ("Debug.Log or verbatim @"Debug\.Log)
+_STRING_LITERAL_RE = re.compile(r'"Debug\\?\.Log')
+
+# Exempted files (legitimate Debug.Log usage)
+EXEMPTED_FILES = frozenset({
+    "ChimeraLogger.cs",
+    "ChimeraScriptableObject.cs",
+    "SharedLogger.cs",
+    "QualityGates.cs",
+    "QualityGateRunner.cs",
+    "AntiPatternMigrationTool.cs",
+    "DebugLogMigrationTool.cs",
+    "DebugLogAutoMigrationTool.cs",
+    "BatchMigrationScript.cs",
+    "GeneticLedger.cs",  # Data layer - circular dependency prevents ChimeraLogger use
+    "SkillTreeIntegrationTest.cs",  # Test file
+})
+
+# Exempted directories (legitimate Debug.Log usage)
+EXEMPTED_DIRS = frozenset({
+    "Shared",
+    "CI",
+    "Editor"
+})
+
+# Debug.Log ban, applied by the shared line-scanning engine in ci_common
+RULE = Rule(
+    name="Debug.Log",
+    violation_re=VIOLATION_RE,
+    fast_marker=_FAST_MARKER,
+    exempt_files=EXEMPTED_FILES,
+    exempt_dirs=EXEMPTED_DIRS,
+    skip_prefixes=_SKIP_PREFIXES,
+    skip_line_re=_STRING_LITERAL_RE,
+)
 
 def check_debug_log_violations():
     """Check for Debug.Log violations in committed files"""
-    violations = []
-
-    # Get all C# files
-    base_path = Path("Assets/ProjectChimera")
-    cs_files = list(base_path.rglob("*.cs"))
-
-    # Exempted files (legitimate Debug.Log usage)
-    exempted_files = {
-        "ChimeraLogger.cs",
-        "ChimeraScriptableObject.cs",
-        "SharedLogger.cs",
-        "QualityGates.cs",
-        "QualityGateRunner.cs",
-        "AntiPatternMigrationTool.cs",
-        "DebugLogMigrationTool.cs",
-        "DebugLogAutoMigrationTool.cs",
-        "BatchMigrationScript.cs",
-        "GeneticLedger.cs",  # Data layer - circular dependency prevents ChimeraLogger use
-        "SkillTreeIntegrationTest.cs",  # Test file
-    }
-    
-    # Exempted directories (legitimate Debug.Log usage)
-    exempted_dirs = {
-        "/Shared/",
-        "/CI/",
-        "/Editor/"
-    }
-
-    # Patterns that indicate violations
-    violation_patterns = [
-        r'Debug\.Log\s*\(',
-        r'Debug\.LogWarning\s*\(',
-        r'Debug\.LogError\s*\(',
-        r'UnityEngine\.Debug\.Log\s*\('
-    ]
-
-    for file_path in cs_files:
-        # Skip exempted files
-        if any(exempt in str(file_path) for exempt in exempted_files):
-            continue
-            
-        # Skip exempted directories
-        if any(exempt_dir in str(file_path) for exempt_dir in exempted_dirs):
-            continue
-
-        # Skip backup files
-        if ".backup" in str(file_path):
-            continue
-
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-
-            for line_num, line in enumerate(lines, 1):
-                line_content = line.strip()
-
-                # Skip comments and string literals that reference Debug.Log
-                if (line_content.startswith('//') or
-                    line_content.startswith('*') or
-                    '\"Debug.Log' in line_content or
-                    '@"Debug\.Log' in line_content):
-                    continue
-
-                # Check for actual Debug.Log violations
-                for pattern in violation_patterns:
-                    if re.search(pattern, line):
-                        violations.append({
-                            'file': str(file_path),
-                            'line': line_num,
-                            'content': line_content,
-                            'pattern': pattern
-                        })
-
-        except Exception as e:
-            print(f"Error processing {file_path}: {e}")
-
-    return violations
-
-def main():
-    """Main enforcement function"""
+    return run_rules([RULE])[RULE.name]
+
+def main(violations=None):
+    """Main enforcement function (run_all.py passes in precomputed violations)"""
     print("🔍 Checking for Debug.Log violations...")
 
-    violations = check_debug_log_violations()
+    if violations is None:
+        violations = check_debug_log_violations()
+
+    # Collect the report and emit it with a single write
+    out = []
 
     if not violations:
-        print("✅ No Debug.Log violations found - migration successful!")
+        out.append("✅ No Debug.Log violations found - migration successful!")
+        write_report(out)
         return 0
 
-    print(f"❌ {len(violations)} Debug.Log violations found:")
-    print("=" * 60)
+    out.append(f"❌ {len(violations)} Debug.Log violations found:")
+    out.append("=" * 60)
 
     for violation in violations:
-        print(f"File: {violation['file']}")
-        print(f"Line {violation['line']}: {violation['content']}")
-        print(f"Pattern: {violation['pattern']}")
-        print("-" * 40)
-
-    print("🚫 COMMIT BLOCKED: Debug.Log violations must be fixed")
-    print("📖 Use ChimeraLogger instead:")
-    print("   ChimeraLogger.Log(\"CATEGORY\", \"message\", this);")
-    print("   ChimeraLogger.LogWarning(\"CATEGORY\", \"message\", this);")
-    print("   ChimeraLogger.LogError(\"CATEGORY\", \"message\", this);")
-
+        out.append(f"File: {violation['file']}")
+        out.append(f"Line {violation['line']}: {violation['content']}")
+        out.append(f"Pattern: {violation['pattern']}")
+        out.append("-" * 40)
+
+    out.append("🚫 COMMIT BLOCKED: Debug.Log violations must be fixed")
+    out.append("📖 Use ChimeraLogger instead:")
+    out.append("   ChimeraLogger.Log(\"CATEGORY\", \"message\", this);")
+    out.append("   ChimeraLogger.LogWarning(\"CATEGORY\", \"message\", this);")
+    out.append("   ChimeraLogger.LogError(\"CATEGORY\", \"message\", this);")
+
+    write_report(out)
     return 1
 
 if __name__ == "__main__":
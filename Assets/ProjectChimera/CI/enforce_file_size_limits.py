@@ -11,81 +11,97 @@ import re
 from pathlib import Path
 from collections import defaultdict
 
+# Don't write __pycache__ into the Unity Assets folder (Unity would generate .meta files for it)
+sys.dont_write_bytecode = True
+
+from ci_common import scan_files, target_cs_files, write_report
+
+# Type declarations and method bodies in one alternation; the named group that
+# matched tells analyze_file_complexity which element was found
+COMPLEXITY_RE = re.compile(
+    r'(?:public|internal|private)\s+(?:(?P<classes>class)|(?P<interfaces>interface)|(?P<enums>enum)|(?P<structs>struct))\s'
+    r'|(?:public|private|protected|internal)(?P<methods>.*?\s+\w+\s*\([^)]*\)\s*\{)'
+)
+
+# System-specific limits (lines)
+# UPDATED STANDARD: 500 lines (Phase 0 pragmatic refactoring complete)
+SYSTEM_LIMITS = {
+    'Core': 500,
+    'Systems': 500,
+    'Data': 500,
+    'UI': 500,
+    'Testing': 600,  # Tests can be longer
+    'Editor': 500,   # Editor tools
+}
+
+# Exempted files (allow larger sizes for specific cases)
+EXEMPTED_FILES = {
+    'QualityGates.cs',  # Quality gates themselves
+    'AntiPatternMigrationTool.cs',  # Migration tools
+    'ServiceContainerBootstrapper.cs',  # Bootstrapper needs comprehensive registration
+    'ServiceContainerBuilder.cs',  # Builder pattern requires extensive configuration
+}
+
 def check_file_size_violations():
     """Check for file size violations in all C# files"""
+    return scan_files(_scan_file, target_cs_files())
+
+def _scan_file(file_path):
+    """Check a single C# file against its system line limit"""
     violations = []
+    path_str = file_path.as_posix()
 
-    # System-specific limits (lines)
-    # UPDATED STANDARD: 500 lines (Phase 0 pragmatic refactoring complete)
-    system_limits = {
-        'Core': 500,
-        'Systems': 500,
-        'Data': 500,
-        'UI': 500,
-        'Testing': 600,  # Tests can be longer
-        'Editor': 500,   # Editor tools
-    }
-
-    base_path = Path("Assets/ProjectChimera")
-    cs_files = list(base_path.rglob("*.cs"))
-
-    # Exempted files (allow larger sizes for specific cases)
-    exempted_files = {
-        'QualityGates.cs',  # Quality gates themselves
-        'AntiPatternMigrationTool.cs',  # Migration tools
-        'ServiceContainerBootstrapper.cs',  # Bootstrapper needs comprehensive registration
-        'ServiceContainerBuilder.cs',  # Builder pattern requires extensive configuration
-    }
-
-    for file_path in cs_files:
-        # Skip backup files
-        if '.backup' in str(file_path):
-            continue
-
-        # Skip exempted files
-        if any(exempt in str(file_path) for exempt in exempted_files):
-            continue
-
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                line_count = len(lines)
-
-            # Determine system type and appropriate limit
-            path_parts = str(file_path).split('/')
-            system_type = determine_system_type(path_parts)
-            limit = system_limits.get(system_type, 500)  # Default 500 lines (updated standard)
-
-            if line_count > limit:
-                violations.append({
-                    'file': str(file_path),
-                    'lines': line_count,
-                    'limit': limit,
-                    'excess': line_count - limit,
-                    'system': system_type,
-                    'severity': calculate_severity(line_count, limit)
-                })
-
-        except Exception as e:
-            print(f"Error processing {file_path}: {e}")
+    # Skip backup files
+    if '.backup' in path_str:
+        return violations
 
-    return violations
+    # Skip exempted files
+    if file_path.name in EXEMPTED_FILES:
+        return violations
 
-def determine_system_type(path_parts):
-    """Determine system type from file path"""
-    path_str = '/'.join(path_parts).lower()
+    # Determine system type and appropriate limit
+    system_type = determine_system_type(path_str.lower())
+    limit = SYSTEM_LIMITS.get(system_type, 500)  # Default 500 lines (updated standard)
+
+    try:
+        # Every line takes at least one byte, so a file no bigger than the
+        # limit in bytes cannot exceed it in lines - decide from stat alone
+        if os.stat(path_str).st_size <= limit:
+            return violations
+
+        # Count newlines on the raw bytes - no decoding needed just to size a file
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        line_count = data.count(b'\n') + (1 if data and not data.endswith(b'\n') else 0)
+
+        if line_count > limit:
+            violations.append({
+                'file': path_str,
+                'lines': line_count,
+                'limit': limit,
+                'excess': line_count - limit,
+                'system': system_type,
+                'severity': calculate_severity(line_count, limit)
+            })
+
+    except Exception as e:
+        print(f"Error processing {file_path}: {e}")
 
-    if '/core/' in path_str:
+    return violations
+
+def determine_system_type(path_lower):
+    """Determine system type from a lowercased posix file path"""
+    if '/core/' in path_lower:
         return 'Core'
-    elif '/systems/' in path_str:
+    elif '/systems/' in path_lower:
         return 'Systems'
-    elif '/data/' in path_str:
+    elif '/data/' in path_lower:
         return 'Data'
-    elif '/ui/' in path_str:
+    elif '/ui/' in path_lower:
         return 'UI'
-    elif '/testing/' in path_str or '/tests/' in path_str:
+    elif '/testing/' in path_lower or '/tests/' in path_lower:
         return 'Testing'
-    elif '/editor/' in path_str:
+    elif '/editor/' in path_lower:
         return 'Editor'
     else:
         return 'Unknown'
@@ -111,21 +127,13 @@ def analyze_file_complexity(file_path):
     except:
         return None
 
-    # Count structural elements
-    classes = len(re.findall(r'(public|internal|private)\s+class\s+', content))
-    interfaces = len(re.findall(r'(public|internal|private)\s+interface\s+', content))
-    enums = len(re.findall(r'(public|internal|private)\s+enum\s+', content))
-    structs = len(re.findall(r'(public|internal|private)\s+struct\s+', content))
-    methods = len(re.findall(r'(public|private|protected|internal).*?\s+\w+\s*\([^)]*\)\s*{', content))
-
-    return {
-        'classes': classes,
-        'interfaces': interfaces,
-        'enums': enums,
-        'structs': structs,
-        'methods': methods,
-        'total_types': classes + interfaces + enums + structs
-    }
+    # Count structural elements in a single scan, bucketed by the group that hit
+    counts = dict.fromkeys(('classes', 'interfaces', 'enums', 'structs', 'methods'), 0)
+    for match in COMPLEXITY_RE.finditer(content):
+        counts[match.lastgroup] += 1
+
+    counts['total_types'] = counts['classes'] + counts['interfaces'] + counts['enums'] + counts['structs']
+    return counts
 
 def suggest_refactoring(violation, complexity):
     """Suggest refactoring approach based on violation and complexity"""
@@ -163,74 +171,81 @@ def main():
 
     violations = check_file_size_violations()
 
+    # Collect the report and emit it with a single write
+    out = []
+
     if not violations:
-        print("✅ No file size violations found - all files within limits!")
+        out.append("✅ No file size violations found - all files within limits!")
+        write_report(out)
         return 0
 
     # Sort violations by severity and size
     violations.sort(key=lambda x: (x['severity'] == 'CRITICAL', x['excess']), reverse=True)
 
-    print(f"\n❌ Found {len(violations)} file size violations:")
-    print("=" * 80)
+    out.append(f"\n❌ Found {len(violations)} file size violations:")
+    out.append("=" * 80)
 
     # Summary by severity
     severity_counts = defaultdict(int)
     for v in violations:
         severity_counts[v['severity']] += 1
 
-    print("\n📊 VIOLATIONS BY SEVERITY:")
+    out.append("\n📊 VIOLATIONS BY SEVERITY:")
     for severity in ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']:
         if severity_counts[severity] > 0:
-            print(f"{severity:8} {severity_counts[severity]:3} files")
+            out.append(f"{severity:8} {severity_counts[severity]:3} files")
 
     # Summary by system
     system_violations = defaultdict(list)
     for v in violations:
         system_violations[v['system']].append(v)
 
-    print(f"\n📂 VIOLATIONS BY SYSTEM:")
+    out.append(f"\n📂 VIOLATIONS BY SYSTEM:")
     for system, sys_violations in sorted(system_violations.items(), key=lambda x: len(x[1]), reverse=True):
         total_excess = sum(v['excess'] for v in sys_violations)
-        print(f"{system:15} {len(sys_violations):3} files  {total_excess:4} excess lines")
+        out.append(f"{system:15} {len(sys_violations):3} files  {total_excess:4} excess lines")
 
-    print(f"\n🚨 TOP 15 VIOLATIONS (by excess lines):")
-    print("-" * 80)
+    out.append(f"\n🚨 TOP 15 VIOLATIONS (by excess lines):")
+    out.append("-" * 80)
 
     for i, violation in enumerate(violations[:15]):
         file_name = Path(violation['file']).name
-        print(f"{i+1:2}. {file_name:35} {violation['lines']:4} lines (limit: {violation['limit']}) +{violation['excess']:3} [{violation['severity']}]")
+        out.append(f"{i+1:2}. {file_name:35} {violation['lines']:4} lines (limit: {violation['limit']}) +{violation['excess']:3} [{violation['severity']}]")
 
         # Show refactoring suggestions for top 5
         if i < 5:
             complexity = analyze_file_complexity(violation['file'])
             suggestions = suggest_refactoring(violation, complexity)
             for suggestion in suggestions[:2]:  # Show top 2 suggestions
-                print(f"    💡 {suggestion}")
-            print()
+                out.append(f"    💡 {suggestion}")
+            out.append("")
 
-    print(f"\n🛠️  RECOMMENDED ACTIONS:")
+    out.append(f"\n🛠️  RECOMMENDED ACTIONS:")
     critical_count = severity_counts.get('CRITICAL', 0)
     high_count = severity_counts.get('HIGH', 0)
 
     if critical_count > 0:
-        print(f"1. IMMEDIATE: Fix {critical_count} CRITICAL violations (>100% over limit)")
+        out.append(f"1. IMMEDIATE: Fix {critical_count} CRITICAL violations (>100% over limit)")
     if high_count > 0:
-        print(f"2. HIGH PRIORITY: Fix {high_count} HIGH violations (>50% over limit)")
+        out.append(f"2. HIGH PRIORITY: Fix {high_count} HIGH violations (>50% over limit)")
 
-    print("3. Use automated file splitter: python3 automated_file_splitter.py")
-    print("4. Use file size reducer: python3 file_size_reducer.py")
-    print("5. Manual refactoring for complex cases")
+    out.append("3. Use automated file splitter: python3 automated_file_splitter.py")
+    out.append("4. Use file size reducer: python3 file_size_reducer.py")
+    out.append("5. Manual refactoring for complex cases")
 
     # Block commit if critical violations exist
     if critical_count > 0:
-        print(f"\n🚫 COMMIT BLOCKED: {critical_count} critical file size violations must be fixed")
+        out.append(f"\n🚫 COMMIT BLOCKED: {critical_count} critical file size violations must be fixed")
+        write_report(out)
         return 1
     elif len(violations) > 110:  # Allow some violations but not too many
-        print(f"\n⚠️  WARNING: {len(violations)} total violations (target: <100)")
-        print("Consider addressing high-priority violations before next release")
+        out.append(f"\n⚠️  WARNING: {len(violations)} total violations (target: <100)")
+        out.append("Consider addressing high-priority violations before next release")
+        write_report(out)
         return 0  # Don't block commit for warnings
     else:
-        print(f"\n✅ COMMIT ALLOWED: {len(violations)} violations within acceptable range")
+        out.append(f"\n✅ COMMIT ALLOWED: {len(violations)} violations within acceptable range")
+        write_report(out)
         return 0
 
 if __name__ == "__main__":
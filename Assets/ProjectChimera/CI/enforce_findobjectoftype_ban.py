@@ -5,100 +5,81 @@ Enforces zero-tolerance for FindObjectOfType violations after migration
 Part of Project Chimera Phase 0 quality gates
 """
 
-import os
 import sys
 import re
-from pathlib import Path
+
+# Don't write __pycache__ into the Unity Assets folder (Unity would generate .meta files for it)
+sys.dont_write_bytecode = True
+
+from ci_common import Rule, run_rules, write_report
+
+# Single alternation covering FindObjectOfType/FindObjectsOfType with or without
+# a GameObject., Object. or UnityEngine.Object. qualifier
+VIOLATION_RE = re.compile(r'(?:GameObject\.|(?:UnityEngine\.)?Object\.)?FindObjects?OfType<[^>]+>\s*\(')
+
+# Literal substring every violation contains; lines without it are never visited
+_FAST_MARKER = "FindObject"
+
+# Comment and attribute prefixes - str.startswith checks the whole tuple in one C call
+_SKIP_PREFIXES = ('//', '*', '[')
+
+# FindObjectOfType quoted inside a string literal
+_STRING_LITERAL_RE = re.compile(r'"FindObjectOfType')
+
+# Exempted files (legitimate FindObjectOfType usage)
+EXEMPTED_FILES = frozenset({
+    "QualityGates.cs",
+    "AntiPatternMigrationTool.cs",
+    "ServiceContainerBootstrapper.cs",  # Uses it for bootstrapping
+    "DefaultLightingService.cs",  # Fallback for lighting service
+    "FindObjectOfTypeMigrationTest.cs",  # Test file
+})
+
+# FindObjectOfType ban, applied by the shared line-scanning engine in ci_common
+RULE = Rule(
+    name="FindObjectOfType",
+    violation_re=VIOLATION_RE,
+    fast_marker=_FAST_MARKER,
+    exempt_files=EXEMPTED_FILES,
+    skip_prefixes=_SKIP_PREFIXES,
+    skip_line_re=_STRING_LITERAL_RE,
+)
 
 def check_findobjectoftype_violations():
     """Check for FindObjectOfType violations in committed files"""
-    violations = []
-
-    # Get all C# files
-    base_path = Path("Assets/ProjectChimera")
-    cs_files = list(base_path.rglob("*.cs"))
-
-    # Exempted files (legitimate FindObjectOfType usage)
-    exempted_files = {
-        "QualityGates.cs",
-        "AntiPatternMigrationTool.cs",
-        "ServiceContainerBootstrapper.cs",  # Uses it for bootstrapping
-        "DefaultLightingService.cs",  # Fallback for lighting service
-        "FindObjectOfTypeMigrationTest.cs",  # Test file
-    }
-
-    # Patterns that indicate violations
-    violation_patterns = [
-        r'FindObjectOfType<[^>]+>\s*\(',
-        r'FindObjectsOfType<[^>]+>\s*\(',
-        r'GameObject\.FindObjectOfType<[^>]+>\s*\(',
-        r'UnityEngine\.Object\.FindObjectOfType<[^>]+>\s*\(',
-        r'Object\.FindObjectOfType<[^>]+>\s*\('
-    ]
-
-    for file_path in cs_files:
-        # Skip exempted files
-        if any(exempt in str(file_path) for exempt in exempted_files):
-            continue
-
-        # Skip backup files
-        if ".backup" in str(file_path):
-            continue
-
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-
-            for line_num, line in enumerate(lines, 1):
-                line_content = line.strip()
-
-                # Skip comments and string literals that reference FindObjectOfType
-                if (line_content.startswith('//') or
-                    line_content.startswith('*') or
-                    '\"FindObjectOfType' in line_content or
-                    line_content.startswith('[')):  # Skip attributes
-                    continue
-
-                # Check for actual FindObjectOfType violations
-                for pattern in violation_patterns:
-                    if re.search(pattern, line):
-                        violations.append({
-                            'file': str(file_path),
-                            'line': line_num,
-                            'content': line_content,
-                            'pattern': pattern
-                        })
-
-        except Exception as e:
-            print(f"Error processing {file_path}: {e}")
-
-    return violations
-
-def main():
-    """Main enforcement function"""
+    return run_rules([RULE])[RULE.name]
+
+def main(violations=None):
+    """Main enforcement function (run_all.py passes in precomputed violations)"""
     print("🔍 Checking for FindObjectOfType violations...")
 
-    violations = check_findobjectoftype_violations()
+    if violations is None:
+        violations = check_findobjectoftype_violations()
+
+    # Collect the report and emit it with a single write
+    out = []
 
     if not violations:
-        print("✅ No FindObjectOfType violations found - migration successful!")
+        out.append("✅ No FindObjectOfType violations found - migration successful!")
+        write_report(out)
         return 0
 
-    print(f"❌ {len(violations)} FindObjectOfType violations found:")
-    print("=" * 70)
+    out.append(f"❌ {len(violations)} FindObjectOfType violations found:")
+    out.append("=" * 70)
 
     for violation in violations:
-        print(f"File: {violation['file']}")
-        print(f"Line {violation['line']}: {violation['content']}")
-        print(f"Pattern: {violation['pattern']}")
-        print("-" * 50)
-
-    print("🚫 COMMIT BLOCKED: FindObjectOfType violations must be fixed")
-    print("📖 Use ServiceContainer instead:")
-    print("   ServiceContainerFactory.Instance?.TryResolve<IServiceInterface>();")
-    print("   Camera.main for Unity Camera components")
-    print("   ServiceContainer.Resolve<ILightingService>().GetMainLight() for Lights")
-
+        out.append(f"File: {violation['file']}")
+        out.append(f"Line {violation['line']}: {violation['content']}")
+        out.append(f"Pattern: {violation['pattern']}")
+        out.append("-" * 50)
+
+    out.append("🚫 COMMIT BLOCKED: FindObjectOfType violations must be fixed")
+    out.append("📖 Use ServiceContainer instead:")
+    out.append("   ServiceContainerFactory.Instance?.TryResolve<IServiceInterface>();")
+    out.append("   Camera.main for Unity Camera components")
+    out.append("   ServiceContainer.Resolve<ILightingService>().GetMainLight() for Lights")
+
+    write_report(out)
     return 1
 
 if __name__ == "__main__":
@@ -5,119 +5,87 @@ Prevents regression by detecting inappropriate Resources.Load usage after IAsset
 Part of Phase 0 quality gates - allows legitimate fallback usage but blocks direct violations
 """
 
-import os
 import sys
 import re
+from functools import lru_cache
 from pathlib import Path
 
-def check_resources_load_violations():
-    """Check for inappropriate Resources.Load usage in all C# files"""
-    violations = []
-
-    # Get all C# files
-    base_path = Path("Assets/ProjectChimera")
-    cs_files = list(base_path.rglob("*.cs"))
-
-    # Exempted files (legitimate Resources.Load usage)
-    exempted_files = {
-        'DefaultAssetManager.cs',     # Default implementation fallback
-        'IAssetManager.cs',          # Interface definitions
-        'AssetManagerTest.cs',       # Test files
-        'QualityGates.cs',           # Quality gates contain patterns as strings
-        'AntiPatternMigrationTool.cs', # Migration tools contain patterns
-        'AudioLoadingService.cs',    # Legitimate audio loading (per quality gates exemption)
-        'DataManager.cs',            # Legitimate data loading (per quality gates exemption)
-        'ServiceContainerBootstrapper.cs', # Bootstrapper fallback implementations
-        'AddressablesMigrationPhase1.cs', # Migration phase implementations
-        'AddressablePrefabResolver.cs',   # Addressables fallback resolver
-        'AddressablesInfrastructure.cs',  # Addressables infrastructure
-        'AddressablesAssetManager.cs',    # Addressables implementation uses Resources as fallback
-        'SchematicManager.cs',        # Construction fallback mechanisms
-        'SpeedTreeAssetManagementService.cs', # SpeedTree fallback mechanisms
-        'enforce_resources_load_ban.py', # This enforcement script itself
-    }
-
-    # Patterns that indicate Resources.Load violations
-    violation_patterns = [
-        r'Resources\.Load<[^>]+>\s*\(',
-        r'Resources\.Load\s*\(',
-        r'Resources\.LoadAll<[^>]+>\s*\(',
-        r'Resources\.LoadAll\s*\(',
-    ]
-
-    for file_path in cs_files:
-        # Skip exempted files
-        if any(exempt in str(file_path) for exempt in exempted_files):
-            continue
-
-        # Skip backup files and test files
-        if any(skip in str(file_path) for skip in [".backup", "Testing/", "Tests/", "Editor/"]):
-            continue
-
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-
-            for line_num, line in enumerate(lines, 1):
-                line_content = line.strip()
-
-                # Skip comments, string literals, and legitimate fallback patterns
-                if (line_content.startswith('//') or
-                    line_content.startswith('*') or
-                    '\"Resources.Load' in line_content or
-                    line_content.startswith('[') or
-                    'Fallback to Resources' in line_content or
-                    'AddressablesAssetManager not available' in line_content):
-                    continue
-
-                # Skip legitimate fallback blocks (check context)
-                if _is_legitimate_fallback(lines, line_num - 1, line_content):
-                    continue
-
-                # Check for Resources.Load violations
-                for pattern in violation_patterns:
-                    if re.search(pattern, line):
-                        violations.append({
-                            'file': str(file_path),
-                            'line': line_num,
-                            'content': line_content,
-                            'pattern': pattern,
-                            'severity': _assess_severity(line_content, file_path)
-                        })
-
-        except Exception as e:
-            print(f"Error processing {file_path}: {e}")
-
-    return violations
-
-def _is_legitimate_fallback(lines, line_idx, line_content):
+# Don't write __pycache__ into the Unity Assets folder (Unity would generate .meta files for it)
+sys.dont_write_bytecode = True
+
+from ci_common import Rule, file_lines, run_rules, write_report
+
+# Single alternation covering Resources.Load and Resources.LoadAll, generic or not
+VIOLATION_RE = re.compile(r'Resources\.Load(?:All)?(?:<[^>]+>)?\s*\(')
+
+# Literal substring every violation contains; lines without it are never visited
+_FAST_MARKER = "Resources.Load"
+
+# Comment and attribute prefixes - str.startswith checks the whole tuple in one C call
+_SKIP_PREFIXES = ('//', '*', '[')
+
+# String literals and inline fallback markers, fused into one scan
+_SKIP_LINE_RE = re.compile(r'"Resources\.Load|Fallback to Resources|AddressablesAssetManager not available')
+
+# Path fragments that skip the file (backups and test/editor code)
+_SKIP_PATH_MARKERS = (".backup", "Testing/", "Tests/", "Editor/")
+
+# Exempted files (legitimate Resources.Load usage)
+EXEMPTED_FILES = frozenset({
+    'DefaultAssetManager.cs',     # Default implementation fallback
+    'IAssetManager.cs',          # Interface definitions
+    'AssetManagerTest.cs',       # Test files
+    'QualityGates.cs',           # Quality gates contain patterns as strings
+    'AntiPatternMigrationTool.cs', # Migration tools contain patterns
+    'AudioLoadingService.cs',    # Legitimate audio loading (per quality gates exemption)
+    'DataManager.cs',            # Legitimate data loading (per quality gates exemption)
+    'ServiceContainerBootstrapper.cs', # Bootstrapper fallback implementations
+    'AddressablesMigrationPhase1.cs', # Migration phase implementations
+    'AddressablePrefabResolver.cs',   # Addressables fallback resolver
+    'AddressablesInfrastructure.cs',  # Addressables infrastructure
+    'AddressablesAssetManager.cs',    # Addressables implementation uses Resources as fallback
+    'SchematicManager.cs',        # Construction fallback mechanisms
+    'SpeedTreeAssetManagementService.cs', # SpeedTree fallback mechanisms
+    'enforce_resources_load_ban.py', # This enforcement script itself
+})
+
+# Fallback indicators (matched against lowercased lines)
+_FALLBACK_INDICATORS = (
+    'fallback to resources',
+    'addressablesassetmanager not available',
+    'fallback mechanism',
+    'if (assetManager == null)',
+    'catch (system.exception',
+    'backup loading method'
+)
+
+# Lines before/after an indicator that count as part of its fallback block
+_FALLBACK_CONTEXT_BEFORE = 4
+_FALLBACK_CONTEXT_AFTER = 5
+
+@lru_cache(maxsize=64)
+def _fallback_lines(path_str):
+    """Return the line numbers inside a fallback context window, found in one pass"""
+    covered = set()
+
+    for line_num, line in enumerate(file_lines(path_str), 1):
+        context_line = line.lower()
+        if any(indicator in context_line for indicator in _FALLBACK_INDICATORS):
+            covered.update(range(line_num - _FALLBACK_CONTEXT_BEFORE,
+                                 line_num + _FALLBACK_CONTEXT_AFTER + 1))
+
+    return frozenset(covered)
+
+def _is_legitimate_fallback(path_str, line_num):
     """Check if this Resources.Load is part of a legitimate fallback mechanism"""
-    # Check previous lines for fallback context
-    context_lines = 5
-    start_idx = max(0, line_idx - context_lines)
-
-    for i in range(start_idx, min(len(lines), line_idx + context_lines)):
-        context_line = lines[i].strip().lower()
-
-        # Look for fallback indicators
-        if any(indicator in context_line for indicator in [
-            'fallback to resources',
-            'addressablesassetmanager not available',
-            'fallback mechanism',
-            'if (assetManager == null)',
-            'catch (system.exception',
-            'backup loading method'
-        ]):
-            return True
-
-    return False
-
-def _assess_severity(line_content, file_path):
+    return line_num in _fallback_lines(path_str)
+
+def _assess_severity(line_content, path_str):
     """Assess severity of the Resources.Load violation"""
-    path_str = str(file_path).lower()
+    path_lower = path_str.lower()
 
     # Critical systems
-    if any(critical in path_str for critical in ['core/', 'manager', 'system']):
+    if any(critical in path_lower for critical in ['core/', 'manager', 'system']):
         return 'HIGH'
 
     # LoadAll calls (performance impact)
@@ -125,13 +93,30 @@ def _assess_severity(line_content, file_path):
         return 'HIGH'
 
     # UI/gameplay systems
-    elif any(ui in path_str for ui in ['ui/', 'gameplay']):
+    elif any(ui in path_lower for ui in ['ui/', 'gameplay']):
         return 'MEDIUM'
 
     # Other systems
     else:
         return 'LOW'
 
+# Resources.Load ban, applied by the shared line-scanning engine in ci_common
+RULE = Rule(
+    name="Resources.Load",
+    violation_re=VIOLATION_RE,
+    fast_marker=_FAST_MARKER,
+    exempt_files=EXEMPTED_FILES,
+    skip_path_markers=_SKIP_PATH_MARKERS,
+    skip_prefixes=_SKIP_PREFIXES,
+    skip_line_re=_SKIP_LINE_RE,
+    is_legitimate=_is_legitimate_fallback,
+    severity=_assess_severity,
+)
+
+def check_resources_load_violations():
+    """Check for inappropriate Resources.Load usage in all C# files"""
+    return run_rules([RULE])[RULE.name]
+
 def suggest_migration(violation):
     """Suggest migration approach for Resources.Load violation"""
     suggestions = [
@@ -149,52 +134,58 @@ def suggest_migration(violation):
 
     return suggestions
 
-def main():
-    """Main enforcement function"""
+def main(violations=None):
+    """Main enforcement function (run_all.py passes in precomputed violations)"""
     print("🔍 Checking for Resources.Load violations...")
 
-    violations = check_resources_load_violations()
+    if violations is None:
+        violations = check_resources_load_violations()
+
+    # Collect the report and emit it with a single write
+    out = []
 
     if not violations:
-        print("✅ No inappropriate Resources.Load usage found!")
-        print("✅ All Resources.Load calls are legitimate fallback mechanisms")
+        out.append("✅ No inappropriate Resources.Load usage found!")
+        out.append("✅ All Resources.Load calls are legitimate fallback mechanisms")
+        write_report(out)
         return 0
 
-    print(f"❌ Found {len(violations)} Resources.Load violations:")
-    print("=" * 70)
+    out.append(f"❌ Found {len(violations)} Resources.Load violations:")
+    out.append("=" * 70)
 
     # Group by severity
     high_violations = [v for v in violations if v['severity'] == 'HIGH']
     medium_violations = [v for v in violations if v['severity'] == 'MEDIUM']
     low_violations = [v for v in violations if v['severity'] == 'LOW']
 
-    print(f"\n📊 VIOLATIONS BY SEVERITY:")
+    out.append(f"\n📊 VIOLATIONS BY SEVERITY:")
     if high_violations:
-        print(f"HIGH     {len(high_violations):3} violations")
+        out.append(f"HIGH     {len(high_violations):3} violations")
     if medium_violations:
-        print(f"MEDIUM   {len(medium_violations):3} violations")
+        out.append(f"MEDIUM   {len(medium_violations):3} violations")
     if low_violations:
-        print(f"LOW      {len(low_violations):3} violations")
+        out.append(f"LOW      {len(low_violations):3} violations")
 
     # Show top violations
     for violation in violations[:10]:
         file_name = Path(violation['file']).name
-        print(f"\nFile: {file_name} [{violation['severity']}]")
-        print(f"Line {violation['line']}: {violation['content']}")
+        out.append(f"\nFile: {file_name} [{violation['severity']}]")
+        out.append(f"Line {violation['line']}: {violation['content']}")
 
         # Show migration suggestions for first few violations
         if violations.index(violation) < 3:
             suggestions = suggest_migration(violation)
             for suggestion in suggestions[:4]:  # Show key suggestions
-                print(f"  {suggestion}")
+                out.append(f"  {suggestion}")
 
-    print("\n🚫 COMMIT BLOCKED: Resources.Load violations must be migrated")
-    print("📖 Migration Instructions:")
-    print("   1. Use IAssetManager interface for all asset loading")
-    print("   2. Implement async/await patterns for better performance")
-    print("   3. Only use Resources.Load in fallback mechanisms with proper comments")
-    print("   4. Consider Addressables for complex asset management scenarios")
+    out.append("\n🚫 COMMIT BLOCKED: Resources.Load violations must be migrated")
+    out.append("📖 Migration Instructions:")
+    out.append("   1. Use IAssetManager interface for all asset loading")
+    out.append("   2. Implement async/await patterns for better performance")
+    out.append("   3. Only use Resources.Load in fallback mechanisms with proper comments")
+    out.append("   4. Consider Addressables for complex asset management scenarios")
 
+    write_report(out)
     return 1
 
 if __name__ == "__main__":
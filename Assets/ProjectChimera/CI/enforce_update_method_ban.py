@@ -5,86 +5,64 @@ Prevents regression by detecting new Update() methods after ITickable migration
 Part of Phase 0 quality gates - zero tolerance for Update() method violations
 """
 
-import os
 import sys
 import re
 from pathlib import Path
 
+# Don't write __pycache__ into the Unity Assets folder (Unity would generate .meta files for it)
+sys.dont_write_bytecode = True
+
+from ci_common import Rule, run_rules, write_report
+
+# Single pattern covering Update() declarations with or without an access modifier
+VIOLATION_RE = re.compile(r'(?:(?:private|protected|public)\s*)?void\s+Update\s*\(\s*\)')
+
+# Literal substring every violation contains; lines without it are never visited
+_FAST_MARKER = "Update"
+
+# Comment and attribute prefixes - str.startswith checks the whole tuple in one C call
+_SKIP_PREFIXES = ('//', '*', '[')
+
+# String literals and ITickable examples, fused into one scan
+_SKIP_LINE_RE = re.compile(r'"Update\(|ITickable')
+
+# Path fragments that skip the file (backups and test/editor code)
+_SKIP_PATH_MARKERS = (".backup", "Testing/", "Tests/", "Editor/")
+
+# Exempted files (legitimate Update() usage)
+EXEMPTED_FILES = frozenset({
+    'UpdateOrchestrator.cs',      # The central Update() system
+    'ITickable.cs',               # Interface definitions and examples
+    'TickableExamples.cs',        # Documentation/examples
+    'UpdateOrchestratorTest.cs',  # Test files
+    'QualityGates.cs',            # Quality gates themselves
+    'AntiPatternMigrationTool.cs', # Migration tools
+    'UpdateMethodMigrator.cs',    # Migration tools contain patterns as strings
+    'enforce_update_method_ban.py', # This enforcement script
+})
+
+# Exempted directories (legitimate Update() usage in interfaces/documentation)
+EXEMPTED_DIRS = frozenset({
+    'Interfaces',  # Interface definitions may have Update() in method signatures
+    'Documentation',
+    'Examples'
+})
+
+# Update() ban, applied by the shared line-scanning engine in ci_common
+RULE = Rule(
+    name="Update()",
+    violation_re=VIOLATION_RE,
+    fast_marker=_FAST_MARKER,
+    exempt_files=EXEMPTED_FILES,
+    exempt_dirs=EXEMPTED_DIRS,
+    skip_path_markers=_SKIP_PATH_MARKERS,
+    skip_prefixes=_SKIP_PREFIXES,
+    skip_line_re=_SKIP_LINE_RE,
+)
+
 def check_update_method_violations():
     """Check for Update() method violations in all C# files"""
-    violations = []
-
-    # Get all C# files
-    base_path = Path("Assets/ProjectChimera")
-    cs_files = list(base_path.rglob("*.cs"))
-
-    # Exempted files (legitimate Update() usage)
-    exempted_files = {
-        'UpdateOrchestrator.cs',      # The central Update() system
-        'ITickable.cs',               # Interface definitions and examples
-        'TickableExamples.cs',        # Documentation/examples
-        'UpdateOrchestratorTest.cs',  # Test files
-        'QualityGates.cs',            # Quality gates themselves
-        'AntiPatternMigrationTool.cs', # Migration tools
-        'UpdateMethodMigrator.cs',    # Migration tools contain patterns as strings
-        'enforce_update_method_ban.py', # This enforcement script
-    }
-    
-    # Exempted directories (legitimate Update() usage in interfaces/documentation)
-    exempted_dirs = {
-        '/Interfaces/',  # Interface definitions may have Update() in method signatures
-        '/Documentation/',
-        '/Examples/'
-    }
-
-    # Patterns that indicate Update() method violations
-    violation_patterns = [
-        r'(private|protected|public)?\s*void\s+Update\s*\(\s*\)',
-        r'void\s+Update\s*\(\s*\)',
-    ]
-
-    for file_path in cs_files:
-        # Skip exempted files
-        if any(exempt in str(file_path) for exempt in exempted_files):
-            continue
-            
-        # Skip exempted directories
-        if any(exempt_dir in str(file_path) for exempt_dir in exempted_dirs):
-            continue
-
-        # Skip backup files and test files
-        if any(skip in str(file_path) for skip in [".backup", "Testing/", "Tests/", "Editor/"]):
-            continue
-
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-
-            for line_num, line in enumerate(lines, 1):
-                line_content = line.strip()
-
-                # Skip comments and string literals
-                if (line_content.startswith('//') or
-                    line_content.startswith('*') or
-                    '\"Update(' in line_content or
-                    line_content.startswith('[') or
-                    'ITickable' in line_content):  # Skip ITickable examples
-                    continue
-
-                # Check for Update() method violations
-                for pattern in violation_patterns:
-                    if re.search(pattern, line):
-                        violations.append({
-                            'file': str(file_path),
-                            'line': line_num,
-                            'content': line_content,
-                            'pattern': pattern
-                        })
-
-        except Exception as e:
-            print(f"Error processing {file_path}: {e}")
-
-    return violations
+    return run_rules([RULE])[RULE.name]
 
 def suggest_migration(violation):
     """Suggest migration approach for Update() method violation"""
@@ -103,39 +81,45 @@ def suggest_migration(violation):
 
     return suggestions
 
-def main():
-    """Main enforcement function"""
+def main(violations=None):
+    """Main enforcement function (run_all.py passes in precomputed violations)"""
     print("🔍 Checking for Update() method violations...")
 
-    violations = check_update_method_violations()
+    if violations is None:
+        violations = check_update_method_violations()
+
+    # Collect the report and emit it with a single write
+    out = []
 
     if not violations:
-        print("✅ No Update() method violations found - ITickable migration successful!")
+        out.append("✅ No Update() method violations found - ITickable migration successful!")
+        write_report(out)
         return 0
 
-    print(f"❌ {len(violations)} Update() method violations found:")
-    print("=" * 70)
+    out.append(f"❌ {len(violations)} Update() method violations found:")
+    out.append("=" * 70)
 
     for violation in violations:
         file_name = Path(violation['file']).name
-        print(f"File: {file_name}")
-        print(f"Line {violation['line']}: {violation['content']}")
+        out.append(f"File: {file_name}")
+        out.append(f"Line {violation['line']}: {violation['content']}")
 
         # Show migration suggestions for first few violations
         if violations.index(violation) < 3:
             suggestions = suggest_migration(violation)
             for suggestion in suggestions[:3]:  # Show key suggestions
-                print(f"  {suggestion}")
+                out.append(f"  {suggestion}")
 
-        print("-" * 50)
+        out.append("-" * 50)
 
-    print("🚫 COMMIT BLOCKED: Update() method violations must be migrated")
-    print("📖 Migration Instructions:")
-    print("   1. Use ITickable interface instead of Update() methods")
-    print("   2. Register with UpdateOrchestrator for centralized update management")
-    print("   3. Use appropriate priority levels for update order")
-    print("   4. Run automated migration: python3 update_method_migrator.py")
+    out.append("🚫 COMMIT BLOCKED: Update() method violations must be migrated")
+    out.append("📖 Migration Instructions:")
+    out.append("   1. Use ITickable interface instead of Update() methods")
+    out.append("   2. Register with UpdateOrchestrator for centralized update management")
+    out.append("   3. Use appropriate priority levels for update order")
+    out.append("   4. Run automated migration: python3 update_method_migrator.py")
 
+    write_report(out)
     return 1
 
 if __name__ == "__main__":
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Project Chimera Enforcement Runner
+Runs every Phase 0 enforcement script in a single process: the line-based
+bans share one pass over the C# files, and the file list and file contents
+are read once and shared between checks
+"""
+
+import sys
+
+# Don't write __pycache__ into the Unity Assets folder (Unity would generate .meta files for it)
+sys.dont_write_bytecode = True
+
+import enforce_debug_log_ban
+import enforce_file_size_limits
+import enforce_findobjectoftype_ban
+import enforce_resources_load_ban
+import enforce_update_method_ban
+from ci_common import run_rules
+
+# Line-based bans, evaluated together by the shared rule engine
+LINE_ENFORCERS = [
+    enforce_debug_log_ban,
+    enforce_findobjectoftype_ban,
+    enforce_resources_load_ban,
+    enforce_update_method_ban,
+]
+
+def main():
+    """Run all enforcers and fail if any of them blocks the commit"""
+    exit_code = 0
+
+    results = run_rules(enforcer.RULE for enforcer in LINE_ENFORCERS)
+
+    for enforcer in LINE_ENFORCERS:
+        if enforcer.main(results[enforcer.RULE.name]) != 0:
+            exit_code = 1
+        print()
+
+    if enforce_file_size_limits.main() != 0:
+        exit_code = 1
+    print()
+
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,10 +5,18 @@ Local development script to run quality gates before committing
 Mirrors the CI/CD pipeline validation logic
 """
 
+import hashlib
+import json
 import os
 import re
 import sys
-from pathlib import Path
+import tempfile
+
+# Don't write __pycache__ into the Unity Assets folder (Unity would generate .meta files for it)
+sys.dont_write_bytecode = True
+
+import ci_common
+from ci_common import map_files, pattern_lines, walk_cs_paths
 
 # Enhanced forbidden patterns (mirrors QualityGates.cs exactly)
 FORBIDDEN_PATTERNS = [
@@ -27,177 +35,312 @@ FORBIDDEN_PATTERNS = [
     r"Assembly\.Load"
 ]
 
+# All forbidden patterns in one alternation; group p<i> identifies FORBIDDEN_PATTERNS[i]
+FORBIDDEN_RE = re.compile("|".join(f"(?P<p{i}>{pattern})" for i, pattern in enumerate(FORBIDDEN_PATTERNS)))
+
+# Same alternation over raw file bytes, used to locate candidate lines without decoding
+_FORBIDDEN_BYTES_RE = re.compile(FORBIDDEN_RE.pattern.encode())
+
+# Literal substring every forbidden pattern contains; files without any are clean
+_LITERALS = (
+    b"FindObject",
+    b"GameObject.Find(",
+    b"Resources.Load",
+    b"Debug.Log",
+    b".GetField(",
+    b".GetProperty",
+    b".GetMethod(",
+    b"Activator.CreateInstance",
+    b"Assembly.Load"
+)
+
+# Comment line prefixes ('//' also covers '///' doc comments)
+_COMMENT_PREFIXES = ('//', '*')
+
+# Forbidden calls quoted in a string literal (migration tools contain patterns as strings)
+_STRLIT_MARKERS = ('"FindObjectOfType', '"Resources.Load', '"Debug.Log')
+
+# Path tokens that exempt a file from some or all anti-pattern checks, by category
+_SKIP_TOKENS = {
+    'quality_gate': ('QualityGateRunner.cs', 'QualityGates.cs', 'run_quality_gates.py'),
+    'migration_tool': ('AntiPatternMigrationTool', 'DebugLogMigrationTool', 'BatchMigration', 'MigrationScript'),
+    'di_infrastructure': ('ServiceContainer', 'ServiceAdvancedFeatures', 'TypedServiceRegistration', '/Core/'),
+    'data_service': ('AudioLoadingService', 'DataManager', '/Interfaces/'),
+    'shared_layer': ('ChimeraLogger.cs', 'ChimeraScriptableObject.cs', 'SharedLogger.cs', '/Shared/'),
+    'legacy_ui': ('UIProgressBarManager', 'UINotificationManager'),
+    'gpu_compute': ('GeneticProofOfWorkGPU.cs',),
+    'marketplace': ('MarketplaceTransactionHelpers.cs', 'MarketplaceTransactionManager.cs'),
+}
+
+# Categories whose files are skipped entirely - no line of them is ever reported
+_EXEMPT_FILE_TOKENS = frozenset(
+    _SKIP_TOKENS['quality_gate'] + _SKIP_TOKENS['migration_tool'] + _SKIP_TOKENS['shared_layer']
+)
+
+# One pass over a path finds every skip token; the lookahead also catches
+# overlapping tokens such as '/Core/' directly followed by '/Shared/'
+_SKIP_RE = re.compile("(?=(" + "|".join(
+    re.escape(token) for tokens in _SKIP_TOKENS.values() for token in tokens
+) + "))")
+
+# Path fragments that exclude a directory (and everything under it) or a file
+_EXCLUDED_NAME_PARTS = ('Testing', 'Editor')
+
 def find_cs_files():
     """Find all C# files excluding Testing and Editor directories"""
-    cs_files = []
-    project_root = Path("Assets/ProjectChimera")
+    project_root = "Assets/ProjectChimera"
 
-    if not project_root.exists():
+    if not os.path.isdir(project_root):
         print("❌ ERROR: Assets/ProjectChimera not found. Run from Unity project root.")
         return []
 
-    for cs_file in project_root.rglob("*.cs"):
-        # Skip Testing and Editor directories
-        if 'Testing' in str(cs_file) or 'Editor' in str(cs_file):
-            continue
-        cs_files.append(cs_file)
+    # Prune Testing and Editor directories without descending into them
+    return list(walk_cs_paths(project_root, _EXCLUDED_NAME_PARTS))
 
-    return cs_files
+def _candidate_lines(content):
+    """Yield (line_num, line) for each line of raw file bytes with a forbidden pattern, decoded
 
-def check_anti_patterns():
-    """Check for forbidden anti-patterns with smart filtering"""
+    Only these lines are ever decoded; the filters below re-check each whole line.
+    """
+    for line_num, line in pattern_lines(content, _FORBIDDEN_BYTES_RE):
+        yield line_num, line.decode('utf-8', errors='replace')
+
+def check_anti_patterns(file_path, content):
+    """Check one file's raw content for forbidden anti-patterns with smart filtering"""
     violations = []
-    cs_files = find_cs_files()
 
-    print(f"📁 Analyzing {len(cs_files)} C# files...")
+    # Path-based skips are invariant for the file - classify the path once, not per line
+    path_tokens = set(_SKIP_RE.findall(file_path))
 
-    for file_path in cs_files:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-
-            for i, line in enumerate(lines, 1):
-                line_content = line.strip()
-                original_line = line_content  # Keep original for fallback checks
-
-                # Smart filtering - exact mirror of QualityGates.cs logic
-                # Skip ALL comment lines (single-line and doc comments)
-                if line_content.startswith('//') or line_content.startswith('///') or line_content.startswith('*'):
-                    continue
-
-                # Skip lines where pattern appears only in comment portion
-                if '//' in line_content:
-                    code_part = line_content.split('//')[0]
-                    # Only check the code part, not the comment
-                    line_content = code_part.strip()
-
-                # Skip string literals (migration tools contain patterns as strings)
-                if '"FindObjectOfType' in line_content or '"Resources.Load' in line_content or '"Debug.Log' in line_content:
-                    continue
-
-                # Skip UnityEngine.Object prefix (legitimate fallback usage)
-                if 'UnityEngine.Object.FindObject' in line_content:
-                    continue
-
-                # Skip ChimeraLogger calls (legitimate logging)
-                if 'ChimeraLogger.Log' in line_content or 'UnityEngine.Debug.Log' in line_content:
-                    continue
-
-                # Skip CI/Quality Gate files (legitimate for testing/validation)
-                if any(skip_file in str(file_path) for skip_file in ['QualityGateRunner.cs', 'QualityGates.cs', 'run_quality_gates.py']):
-                    continue
-
-                # Skip migration tools (contain patterns as examples/strings)
-                if any(skip_file in str(file_path) for skip_file in ['AntiPatternMigrationTool', 'DebugLogMigrationTool', 'BatchMigration', 'MigrationScript']):
-                    continue
-
-                # Skip legitimate ServiceContainer/DI infrastructure reflection usage
-                if any(skip_file in str(file_path) for skip_file in ['ServiceContainer', 'ServiceAdvancedFeatures', 'TypedServiceRegistration', '/Core/']) and ('.GetMethod(' in line_content or 'Activator.CreateInstance' in line_content):
-                    continue
-
-                # Skip legitimate Resources.Load for audio/data loading services and interface definitions
-                if (any(skip_file in str(file_path) for skip_file in ['AudioLoadingService', 'DataManager', '/Interfaces/']) or '// Legacy' in line_content or '// MIGRATION' in line_content) and 'Resources.Load' in line_content:
-                    continue
-
-                # Skip Shared layer infrastructure (legitimate Debug.Log usage)
-                if any(skip_file in str(file_path) for skip_file in ['ChimeraLogger.cs', 'ChimeraScriptableObject.cs', 'SharedLogger.cs', '/Shared/']):
-                    continue
-
-                # Skip GameObject.Find in UI managers (legacy compatibility layer)
-                if any(skip_file in str(file_path) for skip_file in ['UIProgressBarManager', 'UINotificationManager']) and 'GameObject.Find' in line_content:
-                    continue
-
-                # Skip GeneticProofOfWorkGPU Resources.Load (compute shader fallback - not supported by Addressables)
-                if 'GeneticProofOfWorkGPU.cs' in str(file_path) and 'Resources.Load' in line_content and 'Fallback' in original_line:
-                    continue
-
-                # Skip marketplace reflection (avoiding circular assembly dependencies between Systems and Systems.Progression)
-                if ('MarketplaceTransactionHelpers.cs' in str(file_path) or 'MarketplaceTransactionManager.cs' in str(file_path)) and ('.GetProperty(' in line_content or '.GetMethod(' in line_content):
-                    continue
-
-                for pattern in FORBIDDEN_PATTERNS:
-                    if re.search(pattern, line_content):
-                        violations.append({
-                            'file': str(file_path),
-                            'line': i,
-                            'pattern': pattern,
-                            'content': line_content
-                        })
-
-        except Exception as e:
-            print(f"⚠️ Warning: Could not analyze {file_path}: {e}")
+    # Skip CI/Quality Gate files (legitimate for testing/validation), migration
+    # tools (contain patterns as examples/strings) and Shared layer infrastructure
+    # (legitimate Debug.Log usage) before touching their content
+    if not path_tokens.isdisjoint(_EXEMPT_FILE_TOKENS):
+        return violations
+
+    # Plain substring tests rule out most files far faster than the regex can
+    if not any(literal in content for literal in _LITERALS):
+        return violations
+
+    is_di_infrastructure = not path_tokens.isdisjoint(_SKIP_TOKENS['di_infrastructure'])
+    is_data_service = not path_tokens.isdisjoint(_SKIP_TOKENS['data_service'])
+    is_legacy_ui = not path_tokens.isdisjoint(_SKIP_TOKENS['legacy_ui'])
+    is_gpu_compute = not path_tokens.isdisjoint(_SKIP_TOKENS['gpu_compute'])
+    is_marketplace = not path_tokens.isdisjoint(_SKIP_TOKENS['marketplace'])
+
+    for i, line in _candidate_lines(content):
+        line_content = line.strip()
+        original_line = line_content  # Keep original for fallback checks
+
+        # Smart filtering - exact mirror of QualityGates.cs logic
+        # Skip ALL comment lines (single-line and doc comments)
+        if line_content.startswith(_COMMENT_PREFIXES):
+            continue
+
+        # Skip lines where pattern appears only in comment portion
+        if '//' in line_content:
+            code_part = line_content.split('//')[0]
+            # Only check the code part, not the comment
+            line_content = code_part.strip()
+
+        # Skip string literals (migration tools contain patterns as strings)
+        if any(marker in line_content for marker in _STRLIT_MARKERS):
+            continue
+
+        # Skip UnityEngine.Object prefix (legitimate fallback usage)
+        if 'UnityEngine.Object.FindObject' in line_content:
+            continue
+
+        # Skip ChimeraLogger calls (legitimate logging)
+        if 'ChimeraLogger.Log' in line_content or 'UnityEngine.Debug.Log' in line_content:
+            continue
+
+        # Skip legitimate ServiceContainer/DI infrastructure reflection usage
+        if is_di_infrastructure and ('.GetMethod(' in line_content or 'Activator.CreateInstance' in line_content):
+            continue
+
+        # Skip legitimate Resources.Load for audio/data loading services and interface definitions
+        if (is_data_service or '// Legacy' in line_content or '// MIGRATION' in line_content) and 'Resources.Load' in line_content:
+            continue
+
+        # Skip GameObject.Find in UI managers (legacy compatibility layer)
+        if is_legacy_ui and 'GameObject.Find' in line_content:
+            continue
+
+        # Skip GeneticProofOfWorkGPU Resources.Load (compute shader fallback - not supported by Addressables)
+        if is_gpu_compute and 'Resources.Load' in line_content and 'Fallback' in original_line:
+            continue
+
+        # Skip marketplace reflection (avoiding circular assembly dependencies between Systems and Systems.Progression)
+        if is_marketplace and ('.GetProperty(' in line_content or '.GetMethod(' in line_content):
+            continue
+
+        # One scan finds every forbidden pattern on the line
+        hits = {int(match.lastgroup[1:]) for match in FORBIDDEN_RE.finditer(line_content)}
+        for index in sorted(hits):
+            violations.append({
+                'file': file_path,
+                'line': i,
+                'pattern': FORBIDDEN_PATTERNS[index],
+                'content': line_content
+            })
 
     return violations
 
-def check_dependency_injection():
-    """Validate dependency injection patterns"""
+def check_dependency_injection(file_path, content):
+    """Validate dependency injection patterns in one file's raw content"""
     issues = []
-    cs_files = find_cs_files()
 
-    for file_path in cs_files:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Check for deprecated ServiceLocator usage
-            if re.search(r'ServiceLocator\.', content) and 'Fallback' not in content:
-                issues.append({
-                    'file': str(file_path),
-                    'type': 'Deprecated ServiceLocator',
-                    'description': 'Using legacy ServiceLocator - migrate to ServiceContainer'
-                })
-
-            # Check for deprecated DI namespace (excluding Core files and CI files that legitimately reference it)
-            if 'using ProjectChimera.Core.DependencyInjection' in content and '/Core/' not in str(file_path) and '/CI/' not in str(file_path):
-                issues.append({
-                    'file': str(file_path),
-                    'type': 'Deprecated DI Namespace',
-                    'description': 'Using deprecated DependencyInjection namespace - migrate to ServiceContainer'
-                })
-
-        except Exception as e:
-            print(f"⚠️ Warning: Could not analyze {file_path}: {e}")
+    # Check for deprecated ServiceLocator usage
+    if b'ServiceLocator.' in content and b'Fallback' not in content:
+        issues.append({
+            'file': file_path,
+            'type': 'Deprecated ServiceLocator',
+            'description': 'Using legacy ServiceLocator - migrate to ServiceContainer'
+        })
+
+    # Check for deprecated DI namespace (excluding Core files and CI files that legitimately reference it)
+    if b'using ProjectChimera.Core.DependencyInjection' in content and '/Core/' not in file_path and '/CI/' not in file_path:
+        issues.append({
+            'file': file_path,
+            'type': 'Deprecated DI Namespace',
+            'description': 'Using deprecated DependencyInjection namespace - migrate to ServiceContainer'
+        })
 
     return issues
 
-def check_file_sizes():
-    """Check file sizes against limits"""
+def check_file_size(file_path, content):
+    """Check one file's size against the line limit"""
     violations = []
-    cs_files = find_cs_files()
     max_lines = 500  # UPDATED STANDARD: 500 lines (Phase 0 pragmatic refactoring complete)
 
+    # Count non-blank, non-comment lines, stripping each line once
+    line_count = 0
+    for line in content.split(b'\n'):
+        stripped = line.strip()
+        if stripped and not stripped.startswith(b'//'):
+            line_count += 1
+
+    if line_count > max_lines:
+        violations.append({
+            'file': file_path,
+            'line_count': line_count,
+            'max_allowed': max_lines
+        })
+
+    return violations
+
+def _scan_one(file_path):
+    """Read one C# file and return its (anti-pattern, DI, file size) findings, or None if unreadable"""
+    try:
+        # Raw bytes: the checks only decode the few lines they report
+        with open(file_path, 'rb') as f:
+            content = f.read()
+
+        return (check_anti_patterns(file_path, content),
+                check_dependency_injection(file_path, content),
+                check_file_size(file_path, content))
+
+    except Exception as e:
+        print(f"⚠️ Warning: Could not analyze {file_path}: {e}")
+        return None
+
+# Per-file findings from earlier runs, reused while a file's mtime and size are unchanged
+CACHE_PATH = ".quality_gates_cache"
+
+def _cache_schema():
+    """Hash this script and ci_common so edited patterns, filters or scan helpers invalidate every cached result"""
+    digest = hashlib.md5()
+    for source in (__file__, ci_common.__file__):
+        with open(source, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def _load_cache(schema):
+    """Return cached findings by file path, or an empty cache if missing or stale"""
+    try:
+        with open(CACHE_PATH, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(cache, dict) or cache.get('schema') != schema:
+        return {}
+    return cache.get('files', {})
+
+def _save_cache(schema, files):
+    """Write the cache via a temp file and rename so a killed run never leaves it torn"""
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(prefix=CACHE_PATH + '.', dir=os.path.dirname(CACHE_PATH) or '.')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'schema': schema, 'files': files}, f)
+        os.replace(tmp_path, CACHE_PATH)
+    except OSError as e:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        print(f"⚠️ Warning: Could not write {CACHE_PATH}: {e}")
+
+def analyze_files():
+    """Read every changed C# file once and run all quality gate checks on it, across CPU cores"""
+    anti_pattern_violations = []
+    di_issues = []
+    file_size_violations = []
+    cs_files = find_cs_files()
+
+    print(f"📁 Analyzing {len(cs_files)} C# files...")
+
+    schema = _cache_schema()
+    cache = _load_cache(schema)
+    new_cache = {}
+    findings_by_file = {}
+    stamps = {}
+    pending = []
+
+    # Reuse cached findings for files whose (mtime, size) stamp is unchanged
     for file_path in cs_files:
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-
-            line_count = len([l for l in lines if l.strip() and not l.strip().startswith('//')])
+            st = os.stat(file_path)
+        except OSError:
+            pending.append(file_path)
+            continue
 
-            if line_count > max_lines:
-                violations.append({
-                    'file': str(file_path),
-                    'line_count': line_count,
-                    'max_allowed': max_lines
-                })
+        stamp = [st.st_mtime_ns, st.st_size]
+        entry = cache.get(file_path)
+        if entry and entry['stamp'] == stamp:
+            findings_by_file[file_path] = entry['findings']
+            new_cache[file_path] = entry
+        else:
+            stamps[file_path] = stamp
+            pending.append(file_path)
+
+    for file_path, findings in zip(pending, map_files(_scan_one, pending)):
+        if findings is None:
+            continue  # Unreadable - already warned, retried next run
+        findings_by_file[file_path] = findings
+        if file_path in stamps:
+            new_cache[file_path] = {'stamp': stamps[file_path], 'findings': findings}
+
+    # Rewrite only when something changed (new, edited or deleted files)
+    if pending or len(new_cache) != len(cache):
+        _save_cache(schema, new_cache)
 
-        except Exception as e:
-            print(f"⚠️ Warning: Could not analyze {file_path}: {e}")
+    for file_path in cs_files:
+        if file_path in findings_by_file:
+            anti_patterns, issues, size_violations = findings_by_file[file_path]
+            anti_pattern_violations.extend(anti_patterns)
+            di_issues.extend(issues)
+            file_size_violations.extend(size_violations)
 
-    return violations
+    return anti_pattern_violations, di_issues, file_size_violations
 
 def main():
     """Run all quality gate checks"""
     print("🔍 Project Chimera Enhanced Quality Gates")
     print("=" * 60)
 
-    # Check anti-patterns
-    anti_pattern_violations = check_anti_patterns()
-
-    # Check dependency injection
-    di_issues = check_dependency_injection()
-
-    # Check file sizes
-    file_size_violations = check_file_sizes()
+    # Check anti-patterns, dependency injection and file sizes in one pass
+    anti_pattern_violations, di_issues, file_size_violations = analyze_files()
 
     # Separate critical violations (anti-patterns, DI) from warnings (file size)
     critical_violations = len(anti_pattern_violations) + len(di_issues)